@@ -1,18 +1,24 @@
+import functools
+import logging
 import os
+import re
+import tempfile
+from queue import Empty, Full, LifoQueue
 from datetime import datetime
+from uuid import uuid4
 from typing import List, NoReturn, Optional, Type, cast
 
 import inflection
 import pytz
-from flask import Flask, session as flask_session
+from flask import Flask, Response, request as flask_request, session as flask_session
 from flask_httpauth import HTTPBasicAuth
-from flask_injector import FlaskInjector, request
-from flask_session import RedisSessionInterface, Session
-from injector import Injector, Module, provider, singleton
+from flask_injector import FlaskInjector, RequestScope
+from injector import Injector, Module, ScopeDecorator, provider, singleton
+from redis import BlockingConnectionPool
+from jinja2 import FileSystemBytecodeCache
 from jinja2.tests import test_undefined
 from redis import Redis
 from uw_it.flask_util.logger import FlaskJSONLogger
-from uw_saml2 import mock, python3_saml
 from werkzeug.exceptions import HTTPException, InternalServerError
 from werkzeug.local import LocalProxy
 
@@ -25,21 +31,191 @@ from husky_directory.blueprints.saml import (
 from husky_directory.blueprints.search import SearchBlueprint
 from husky_directory.models.search import SearchDirectoryInput
 from husky_directory.services.object_store import ObjectStoreInjectorModule
-from husky_directory.util import MetricsClient
+from husky_directory.util import MetricsClient, provide_current_year
 from .app_config import (
     ApplicationConfig,
     ApplicationConfigInjectorModule,
 )
 
 
+# Liveness probes hit this path several times a minute; it deliberately has
+# no dependencies so it can skip dependency injection and session handling.
+HEALTH_PATH = "/health"
+_HEALTH_BODY = b'{"alive": true}\n'
+
+
+def health_probe() -> Response:
+    """
+    A bare liveness probe. For readiness (version, PWS connectivity), see
+    AppBlueprint.health at /status.
+    """
+    # A fresh (but trivially cheap) Response per request, because werkzeug
+    # finalizes response objects in place.
+    return Response(_HEALTH_BODY, mimetype="application/json")
+
+
+class PooledRequestScope(RequestScope):
+    """
+    The stock RequestScope allocates a fresh scope dict for every request,
+    which the allocator then has to grow as scoped services resolve. Since
+    the set of request-scoped services is stable, we recycle the (cleared)
+    dicts through a small LIFO pool so steady-state requests reuse
+    already-sized dicts instead of allocating new ones.
+    """
+
+    _POOL_SIZE = 64
+
+    def configure(self) -> None:
+        self._pool: LifoQueue = LifoQueue(maxsize=self._POOL_SIZE)
+        super().configure()
+
+    def prepare(self) -> None:
+        try:
+            self._locals.scope = self._pool.get_nowait()
+        except Empty:
+            self._locals.scope = {}
+
+    def cleanup(self) -> None:
+        scope = getattr(self._locals, "scope", None)
+        if scope is not None:
+            scope.clear()
+            try:
+                self._pool.put_nowait(scope)
+            except Full:
+                pass
+        super().cleanup()
+
+
+# Providers decorated with this behave exactly like flask_injector's
+# `request` scope, but participate in the dict pooling above.
+request = ScopeDecorator(PooledRequestScope)
+
+
+# dictConfig (run by FlaskJSONLogger) re-initializes the global logging tree,
+# which only needs to happen once per process; without this guard, every
+# create_app() call (each test, each preforked worker doing a re-import)
+# pays that cost again.
+_LOGGING_CONFIGURED = False
+
+
+def configure_app_logging(app: Flask) -> NoReturn:
+    """
+    Configures global logging exactly once per process, while still giving
+    every app instance its own logger and request-id hook.
+    """
+    global _LOGGING_CONFIGURED
+    if not _LOGGING_CONFIGURED:
+        FlaskJSONLogger(app)
+        _LOGGING_CONFIGURED = True
+        return
+
+    # Mirrors the per-app wiring of FlaskJSONLogger.init_app, minus the
+    # process-global dictConfig call that already ran.
+    app.logger = logging.getLogger("gunicorn.error").getChild("app")
+
+    @app.before_request
+    def generate_request_id():
+        flask_request.request_id = str(uuid4())
+
+
+# The handler logs through the same logger configure_app_logging assigns to
+# every app instance, so it can live at module scope instead of being
+# re-created as a closure for each create_app() call.
+_error_logger = logging.getLogger("gunicorn.error.app")
+
+
+def log_all_errors(e: Exception):
+    if isinstance(e, HTTPException):
+        # 4xx noise (malformed bot queries, etc.) is logged without a
+        # traceback; werkzeug already carries the interesting detail.
+        _error_logger.info(str(e))
+        return e
+    if _error_logger.isEnabledFor(logging.ERROR):
+        # exception() formats the whole traceback, so don't pay for it
+        # when ERROR is filtered out anyway.
+        _error_logger.exception(e)
+    return InternalServerError(str(e), original_exception=e)
+
+
 def attach_app_error_handlers(app: Flask) -> NoReturn:
-    @app.errorhandler(Exception)
-    def log_all_errors(e: Exception):
-        if isinstance(e, HTTPException):
-            app.logger.info(str(e))
-            return e
-        app.logger.exception(e)
-        return InternalServerError(str(e), original_exception=e)
+    app.register_error_handler(Exception, log_all_errors)
+
+
+# The jinja filters and tests below live at module scope (instead of as
+# closures inside register_jinja_extensions) so that building an app doesn't
+# allocate a fresh set of function objects every time; they are registered
+# by reference for each app instance.
+#
+# The inflection-backed filters are memoized because they run regex-heavy,
+# pure-python transforms over a small, recurring vocabulary (field names,
+# population labels), which a results page may repeat hundreds of times.
+@functools.lru_cache(maxsize=1024)
+def titleize(text):
+    """
+    Turns snake_case and camelCase into "Snake Case" and "Camel Case," respectively.
+    Use: {{ some_string|titleize }}
+    """
+    return inflection.titleize(text)
+
+
+@functools.lru_cache(maxsize=1024)
+def singularize(text: str):
+    """
+    Takes something plural and makes it singular.
+    Use: {{ "parrots"|singularize }}
+    """
+    return inflection.singularize(text)
+
+
+# One C-level regex scan; inflection.parameterize does the same work with a
+# multi-pass pure-python pipeline.
+_LINKIFY_RE = re.compile(r"[^a-zA-Z0-9]+")
+
+
+@functools.lru_cache(maxsize=1024)
+def linkify(text: str):
+    """
+    Replaces all non alphanum characters with '-' and lowercases
+    everything.
+        "foo: bar baz st. claire" => "foo-bar-baz-st-claire"
+    use: {{ "Foo Bar Baz St. Claire"|linkify }}
+    """
+    return _LINKIFY_RE.sub("-", text).strip("-").lower()
+
+
+# The internal-to-external translation table for the externalize filter.
+_EXTERNALIZE_MAP = {"employees": "faculty/staff"}
+
+
+def externalize(text):
+    """
+    Some values are great for api models but not so great for humans. So, this allows for that extra layer
+    of translation where needed.
+
+    If this grows beyond a simple lookup for any reason, the table above
+    should be moved into its own service.
+    """
+    return _EXTERNALIZE_MAP.get(text, text)
+
+
+def blank(val):
+    """
+    A quick way to test whether a value is undefined OR none.
+    This is an alternative to writing '{% if val is defined and val is not sameas None %}'
+    """
+    return test_undefined(val) or val is None
+
+
+# The search attributes never change after class definition, so the context
+# dict handed to every render is built exactly once here.
+SEARCH_ATTRIBUTES = tuple(SearchDirectoryInput.search_methods())
+_SEARCH_ATTRIBUTES_CONTEXT = {"search_attributes": SEARCH_ATTRIBUTES}
+
+# Pre-warm the filter caches with the values every page renders.
+for _search_method in SEARCH_ATTRIBUTES:
+    titleize(_search_method)
+    singularize(_search_method)
+    linkify(_search_method)
 
 
 def get_app_injector_modules() -> List[Type[Module]]:
@@ -55,8 +231,6 @@ def create_app_injector() -> Injector:
 
 
 class AppInjectorModule(Module):
-    search_attributes = SearchDirectoryInput.search_methods()
-
     @provider
     @request
     def provide_request_session(self) -> LocalProxy:
@@ -66,62 +240,16 @@ class AppInjectorModule(Module):
 
     def register_jinja_extensions(self, app: Flask):
         """You can define jinja filters here in order to make them available in our jinja templates."""
-
-        @app.template_filter()
-        def titleize(text):
-            """
-            Turns snake_case and camelCase into "Snake Case" and "Camel Case," respectively.
-            Use: {{ some_string|titleize }}
-            """
-            return inflection.titleize(text)
-
-        @app.template_filter()
-        def singularize(text: str):
-            """
-            Takes something plural and makes it singular.
-            Use: {{ "parrots"|singularize }}
-            """
-            return inflection.singularize(text)
-
-        @app.template_filter()
-        def linkify(text: str):
-            """
-            Replaces all non alphanum characters with '-' and lowercases
-            everything.
-                "foo: bar baz st. claire" => "foo-bar-baz-st-claire"
-            use: {{ "Foo Bar Baz St. Claire"|linkify }}
-            """
-            return inflection.parameterize(text)
-
-        @app.template_filter()
-        def externalize(text):
-            """
-            Some values are great for api models but not so great for humans. So, this allows for that extra layer
-            of translation where needed.
-
-            If this gets more complicated for any reason, this table of internal vs. external values should be
-            moved into its own service, or at least a dict.
-            """
-            if text == "employees":
-                return "faculty/staff"
-            return text
-
-        @app.template_test()
-        def blank(val):
-            """
-            A quick way to test whether a value is undefined OR none.
-            This is an alternative to writing '{% if val is defined and val is not sameas None %}'
-            """
-            return test_undefined(val) or val is None
+        for filter_ in (titleize, singularize, linkify, externalize):
+            app.add_template_filter(filter_)
+        app.add_template_test(blank)
 
         @app.context_processor
         def provide_search_attributes():
             """Makes the list of search attributes available to the parser without having to hard-code them."""
-            return {"search_attributes": self.search_attributes}
+            return _SEARCH_ATTRIBUTES_CONTEXT
 
-        @app.context_processor
-        def provide_current_year():
-            return {"current_year": datetime.utcnow().year}
+        app.context_processor(provide_current_year)
 
     @provider
     @singleton
@@ -144,12 +272,28 @@ class AppInjectorModule(Module):
         app = Flask("husky_directory")
         app.jinja_env.trim_blocks = True
         app.jinja_env.lstrip_blocks = True
+        if app_settings.stage != "development":
+            # Outside of development, templates never change underneath a
+            # running worker, so there is no reason to re-stat (and possibly
+            # re-parse) them on every request.
+            app.jinja_env.auto_reload = False
+        # Persist compiled template bytecode so that workers (and restarts)
+        # only pay template compilation once per deployment.
+        bytecode_cache_dir = os.path.join(tempfile.gettempdir(), "jinja_cache")
+        os.makedirs(bytecode_cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(
+            directory=bytecode_cache_dir
+        )
         app.config.update(app_settings.app_configuration)
         app.url_map.strict_slashes = (
             False  # Allows both '/search' and '/search/' to work
         )
 
         if app_settings.auth_settings.use_test_idp:
+            # Imported here so production workers don't pay for the mock
+            # IdP machinery at startup.
+            from uw_saml2 import mock, python3_saml
+
             python3_saml.MOCK = True
             mock.MOCK_LOGIN_URL = "/mock-saml/login"
             app.register_blueprint(mock_saml_blueprint)
@@ -161,12 +305,36 @@ class AppInjectorModule(Module):
 
         # Bind an injector to the app itself to manage the scopes of
         # our dependencies appropriate for each request.
-        FlaskInjector(app=app, injector=injector)
-        FlaskJSONLogger(app)
+        FlaskInjector(
+            app=app, injector=injector, request_scope_class=PooledRequestScope
+        )
+        # Services decorated with flask_injector's stock `request` scope
+        # resolve their scope instance by the RequestScope class; alias the
+        # base class to the pooled instance so every request-scoped binding
+        # shares the store that actually gets prepared and cleaned up per
+        # request.
+        injector.binder.bind(
+            RequestScope, to=injector.get(PooledRequestScope), scope=singleton
+        )
+        # Registered after FlaskInjector on purpose, so the probe view is
+        # never wrapped with injection bookkeeping it doesn't use.
+        app.add_url_rule(HEALTH_PATH, view_func=health_probe)
+        configure_app_logging(app)
         self._configure_app_session(app, app_settings, redis)
         self._configure_prometheus(app, app_settings, injector)
+        # Werkzeug compiles its routing matcher lazily; exercising it once
+        # here keeps the first real request from paying the rebuild. This
+        # must come after the last route registration (_configure_prometheus
+        # adds /metrics), since any later add_url_rule marks the map for a
+        # full remap.
+        app.url_map.bind("localhost").match(HEALTH_PATH, method="GET")
         attach_app_error_handlers(app)
         self.register_jinja_extensions(app)
+        if app_settings.stage != "development":
+            # Compile every template up front so the first request after a
+            # deploy doesn't absorb the compilation cost.
+            for template_name in app.jinja_env.list_templates():
+                app.jinja_env.get_template(template_name)
         app.logger.info(
             f"Application worker started at "
             f'{datetime.utcnow().astimezone(pytz.timezone("US/Pacific"))}'
@@ -222,29 +390,49 @@ class AppInjectorModule(Module):
         # TODO: It seems like flask_sessions is actually an abandoned project, so it might
         #       be better to just remove it and implement our own session
         #       interface based on their work. But this is fine for now.
+        # Imported here (rather than at module scope) so that importing
+        # husky_directory.app doesn't drag in flask_session and its
+        # dependencies before we know which backend is configured.
         if app.config["SESSION_TYPE"] == "redis":
+            from husky_directory.session import PipelinedRedisSessionInterface
+
             redis_settings = app_settings.redis_settings
             app.logger.info(
                 f"Setting up redis session cache with settings: {redis_settings.flask_config_values}"
             )
-            app.session_interface = RedisSessionInterface(
+            app.session_interface = PipelinedRedisSessionInterface(
                 redis,
                 key_prefix=redis_settings.flask_config_values["SESSION_KEY_PREFIX"],
+                sessionless_paths=(HEALTH_PATH,),
             )
+            # Share the pooled client with anything else that needs redis,
+            # so nobody is tempted to construct a second connection pool.
+            app.extensions["redis"] = redis
         else:
+            from flask_session import Session
+
             Session(app)
 
     @provider
+    @singleton
     def provide_redis(self, app_settings: ApplicationConfig) -> Redis:
         redis_settings = app_settings.redis_settings
         if not redis_settings.password:
             return None
-        return Redis(
+        # A singleton, pooled client keeps us from paying connection setup
+        # per request; BlockingConnectionPool makes bursts queue for a free
+        # connection instead of erroring out, and keepalive stops idle
+        # sockets from being torn down between requests.
+        pool = BlockingConnectionPool(
             host=redis_settings.host,
             port=redis_settings.port,
             username=redis_settings.namespace,
             password=redis_settings.password.get_secret_value(),
+            max_connections=redis_settings.max_connections,
+            socket_keepalive=True,
+            timeout=5,
         )
+        return Redis(connection_pool=pool)
 
 
 def create_app(injector: Optional[Injector] = None) -> Flask:
@@ -1,16 +1,19 @@
 import logging
 import os
 import secrets
-import string
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Optional, TypeVar, cast
+from typing import Any, ClassVar, Dict, Optional, Tuple, TypeVar
 
 from injector import Module, provider, singleton
-from pydantic import BaseSettings, Field, SecretStr, validator
+from pydantic import BaseSettings, Field, PrivateAttr, SecretStr, validator
 
 logger = logging.getLogger("app_config")
 
+_DEFAULT_SETTINGS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "settings"
+)
+
 
 class SessionType(Enum):
     """Session interface types. See flask-session documentation for full list of possibilities."""
@@ -48,6 +51,44 @@ class FlaskConfigurationSettings(BaseSettings):
         """
         return {}
 
+    # Resolved once per class by __init_subclass__ below: for every plain
+    # field that declares a flask config key, its resolved key and whether
+    # the field's value needs Enum unwrapping; plus the names of fields
+    # holding nested FlaskConfigurationSettings models. This keeps repeated
+    # pydantic FieldInfo introspection out of the flattening loop.
+    _FLASK_KEY_MAP: ClassVar[Dict[str, Tuple[str, bool]]] = {}
+    _SUBMODEL_FIELDS: ClassVar[Tuple[str, ...]] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        key_map: Dict[str, Tuple[str, bool]] = {}
+        submodels = []
+        for field_name, model_field in cls.__fields__.items():
+            if isinstance(model_field.type_, type) and issubclass(
+                model_field.type_, FlaskConfigurationSettings
+            ):
+                submodels.append(field_name)
+                continue
+            extra = model_field.field_info.extra
+            flask_key = extra.get("flask_config_key")
+            if (
+                flask_key == "_env"
+            ):  # If someone wants to use the same name as the environment variable
+                flask_key = extra["env"]
+            if flask_key:
+                is_enum = isinstance(model_field.type_, type) and issubclass(
+                    model_field.type_, Enum
+                )
+                key_map[field_name] = (flask_key, is_enum)
+        cls._FLASK_KEY_MAP = key_map
+        cls._SUBMODEL_FIELDS = tuple(submodels)
+
+    # Flattening the settings tree is only needed once per process (for
+    # app.config.update at startup), but nothing stops repeat reads, so the
+    # result is memoized per instance. A PrivateAttr keeps the cache out of
+    # pydantic's field machinery (and therefore out of .dict() output).
+    _app_configuration_cache: Optional[Dict[str, Any]] = PrivateAttr(None)
+
     @property
     def app_configuration(self) -> Dict[str, Any]:
         """
@@ -67,27 +108,21 @@ class FlaskConfigurationSettings(BaseSettings):
             print(mod_settings.app_configuration)
                 { "FOO_BAR": 42, "MODULE_BAZ": 24 }
         """
+        if self._app_configuration_cache is None:
+            self._app_configuration_cache = self._flatten_app_configuration()
+        return self._app_configuration_cache
+
+    def _flatten_app_configuration(self) -> Dict[str, Any]:
         # If the instance has set any overrides that aren't natively included by
         # the 'flask_config_key' attribute, we'll ensure they are included too.
         results = self.flask_config_values
-
-        for field in self.dict().keys():
+        for field in self._SUBMODEL_FIELDS:
             value = getattr(self, field)
             if isinstance(value, FlaskConfigurationSettings):
                 results.update(value.app_configuration)
-                continue
-            field_config = self.__fields__[field].field_info.extra
-            flask_key = field_config.get("flask_config_key")
-
-            if (
-                flask_key == "_env"
-            ):  # If someone wants to use the same name as the environment variable
-                flask_key = field_config["env"]
-
-            if flask_key:
-                if isinstance(value, Enum):
-                    value = value.value
-                results[flask_key] = value
+        for field, (flask_key, is_enum) in self._FLASK_KEY_MAP.items():
+            value = getattr(self, field)
+            results[flask_key] = value.value if is_enum else value
         return results
 
 
@@ -101,6 +136,9 @@ class RedisSettings(FlaskConfigurationSettings):
     port: str = Field("6379", env="REDIS_PORT")
     namespace: str = Field(None, env="REDIS_NAMESPACE")
     password: SecretStr = Field(None, env="REDIS_PASSWORD")
+    # Upper bound on the shared connection pool; size this to the worker's
+    # expected concurrency (threads/greenlets), not to request volume.
+    max_connections: int = Field(64, env="REDIS_MAX_CONNECTIONS")
     default_cache_expire_seconds: Optional[int] = Field(
         None, env="REDIS_CACHE_DEFAULT_EXPIRE_SECONDS"
     )
@@ -147,8 +185,9 @@ class SessionSettings(FlaskConfigurationSettings):
         """
         if val:
             return val
-        characters = string.ascii_letters + string.digits
-        return "".join(secrets.choice(characters) for _ in range(24))
+        # token_urlsafe pulls its entropy in a single os.urandom call,
+        # versus 24 interpreter round-trips through secrets.choice.
+        return secrets.token_urlsafe(18)
 
 
 class AuthSettings(FlaskConfigurationSettings):
@@ -166,6 +205,11 @@ class PWSSettings(FlaskConfigurationSettings):
 
     pws_host: str = Field(..., env="PWS_HOST")
     pws_default_path: str = Field(..., env="PWS_DEFAULT_PATH")
+    # How long a readiness probe result is trusted before PWS is re-probed.
+    # Failures expire faster so recovery is noticed promptly, while still
+    # bounding the request rate against PWS during probe storms.
+    ready_check_success_ttl: int = Field(10, env="PWS_READY_CHECK_SUCCESS_TTL")
+    ready_check_failure_ttl: int = Field(2, env="PWS_READY_CHECK_FAILURE_TTL")
 
 
 class MetricsSettings(FlaskConfigurationSettings):
@@ -255,18 +299,25 @@ class ApplicationConfig(FlaskConfigurationSettings):
     settings_dir: str
     stage: str = Field(..., env="FLASK_ENV")
     version: Optional[str] = Field(None, env="HUSKY_DIRECTORY_VERSION")
-    start_time: datetime = Field(datetime.now())
+    # default_factory so "now" means construction time, not module import
+    # time (a class-scope default would bake in a single import-time read).
+    start_time: datetime = Field(default_factory=datetime.now)
     deployment_id: Optional[str] = Field(None, env="DEPLOYMENT_ID")
     show_experimental: Optional[bool] = Field(None, env="SHOW_EXPERIMENTAL_FEATURES")
 
-    # Aggregated Settings
-    pws_settings: PWSSettings = PWSSettings()
-    auth_settings: AuthSettings = AuthSettings()
-    session_settings: SessionSettings = SessionSettings()
-    redis_settings: RedisSettings = RedisSettings()
-    metrics_settings: MetricsSettings = MetricsSettings()
-    cache_expiration_settings: CacheExpirationSettings = CacheExpirationSettings()
-    secrets: ApplicationSecrets = ApplicationSecrets()
+    # Aggregated Settings. These use default_factory (rather than eager
+    # instance defaults) so that each sub-model's env/dotenv scan happens
+    # once per ApplicationConfig instantiation instead of at module import,
+    # and so that instances never alias a shared class-level default.
+    pws_settings: PWSSettings = Field(default_factory=PWSSettings)
+    auth_settings: AuthSettings = Field(default_factory=AuthSettings)
+    session_settings: SessionSettings = Field(default_factory=SessionSettings)
+    redis_settings: RedisSettings = Field(default_factory=RedisSettings)
+    metrics_settings: MetricsSettings = Field(default_factory=MetricsSettings)
+    cache_expiration_settings: CacheExpirationSettings = Field(
+        default_factory=CacheExpirationSettings
+    )
+    secrets: ApplicationSecrets = Field(default_factory=ApplicationSecrets)
 
     @validator("redis_settings")
     def validate_redis_settings(
@@ -274,16 +325,52 @@ class ApplicationConfig(FlaskConfigurationSettings):
     ) -> Optional[RedisSettings]:
         """Ensures that, if redis is the selected session type, a redis setting object is created if it is not
         already passed in."""
+        session_settings: Optional[SessionSettings] = values.get("session_settings")
         if (
-            cast(SessionSettings, values.get("session_settings")).session_type
-            == SessionType.redis
-            and not redis_settings
+            redis_settings is None
+            and session_settings is not None
+            and session_settings.session_type is SessionType.redis
         ):
             return RedisSettings()
         return redis_settings
 
 
+def _collect_settings_env_names(model, into: set) -> set:
+    """
+    Recursively gathers every environment variable name any settings model
+    (or nested settings model) can read; pydantic records these per field
+    in ``field_info.extra["env_names"]`` when a BaseSettings class is built.
+    """
+    for model_field in model.__fields__.values():
+        for name in model_field.field_info.extra.get("env_names", ()):
+            into.add(name.lower())
+        if isinstance(model_field.type_, type) and issubclass(
+            model_field.type_, BaseSettings
+        ):
+            _collect_settings_env_names(model_field.type_, into)
+    return into
+
+
+# The full set of environment variables that can influence a parsed
+# ApplicationConfig; their live values are folded into the settings-cache
+# key below so that env overrides are never served stale.
+_SETTINGS_ENV_NAMES = tuple(
+    sorted(_collect_settings_env_names(ApplicationConfig, set()))
+)
+
+
 class ApplicationConfigInjectorModule(Module):
+    # Parsing the dotenv file and validating every settings model is
+    # surprisingly expensive, and happens once per injector (i.e., once per
+    # test, and once per gunicorn worker). Since the inputs rarely change
+    # within a process lifetime, we keep the pristine parsed result here,
+    # keyed on the resolved file path, and invalidate whenever the file's
+    # (mtime, size) or any settings-relevant environment variable changes
+    # (env vars override the dotenv file, so they are part of the key).
+    # Consumers always receive a deep copy so that mutating one injector's
+    # config (as tests do) cannot leak into another's.
+    _settings_cache: Dict[str, Tuple[Tuple, ApplicationConfig]] = {}
+
     @provider
     @singleton
     def provide_application_config(self) -> ApplicationConfig:
@@ -294,18 +381,39 @@ class ApplicationConfigInjectorModule(Module):
         from APP_DOTENV_FILE.
         """
         # Before we do anything else, we load some bootstrapping environment variables to tell us
-        # how to load the rest of our settings.
-        settings_dir = os.environ.get(
-            "APP_SETTINGS_DIR",
-            default=os.path.join(
-                os.path.dirname(os.path.abspath(__file__)), "settings"
-            ),
-        )
-        settings_file = os.environ.get("APP_DOTENV_FILE", "base.dotenv")
+        # how to load the rest of our settings. The env lookups stay dynamic
+        # (tests override them), but the filesystem-derived default is fixed
+        # for the process and computed once at module load.
+        env = os.environ
+        settings_dir = env.get("APP_SETTINGS_DIR", _DEFAULT_SETTINGS_DIR)
+        settings_file = env.get("APP_DOTENV_FILE", "base.dotenv")
         settings_file_path = os.path.join(settings_dir, settings_file)
+
+        # BaseSettings matches env vars case-insensitively, so the key is
+        # built from the lowercased environment.
+        lower_env = {key.lower(): value for key, value in env.items()}
+        env_state = tuple(
+            (name, lower_env[name]) for name in _SETTINGS_ENV_NAMES if name in lower_env
+        )
+        try:
+            stat = os.stat(settings_file_path)
+            cache_key: Optional[Tuple] = (stat.st_mtime, stat.st_size, env_state)
+        except OSError:
+            # If the file can't be statted, fall back on uncached behavior;
+            # pydantic tolerates a missing env file.
+            cache_key = None
+
+        if cache_key is not None:
+            cached = self._settings_cache.get(settings_file_path)
+            if cached and cached[0] == cache_key:
+                return cached[1].copy(deep=True)
+
         config = ApplicationConfig(
             _env_file=settings_file_path, settings_dir=settings_dir
         )
+        if cache_key is not None:
+            self._settings_cache[settings_file_path] = (cache_key, config)
+            return config.copy(deep=True)
         return config
 
 
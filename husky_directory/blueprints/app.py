@@ -1,3 +1,4 @@
+import time
 from typing import Optional
 
 from flask import Blueprint, Request, jsonify
@@ -32,23 +33,51 @@ class AppBlueprint(Blueprint, AppLoggerMixIn):
         self.add_url_rule("/status", view_func=self.health)
         self.config = app_config
         self.start_time = app_config.start_time
-        self._app_config = app_config
+        # start_time never changes after bootstrap, so format it once here
+        # instead of on every health probe.
+        self._start_time_str = self.start_time.strftime("%y-%m-%d %H:%M:%S")
+        # deployment_id is immutable for the life of the process, so hold
+        # the scalar directly rather than walking the config per probe.
+        # (version is *not* snapshotted; see the `ready` property.)
+        self._deployment_id = app_config.deployment_id
         self._injector = injector
-        self.__pws_result = None
+        # Static template for the /status payload; health() copies it and
+        # fills in only the fields that can change between probes.
+        self._health_template = {
+            "ready": False,
+            "version": None,
+            "pws_is_ready": False,
+            "start_time": self._start_time_str,
+            "deployment_id": self._deployment_id,
+        }
+        self.__pws_result: Optional[bool] = None
+        self.__pws_checked_at: float = 0.0
 
     @property
     def version(self) -> Optional[str]:
         return self.config.version
 
     @property
-    def pws_is_ready(self):
-        if not self.__pws_result:
-            try:
-                self._injector.get(PersonWebServiceClient).validate_connection()
-                self.__pws_result = True
-            except Exception as e:
-                self.logger.error(f"{e.__class__}: {str(e)}")
-                self.__pws_result = False
+    def pws_is_ready(self) -> bool:
+        # `None` is the only "never probed" sentinel; a cached `False` is
+        # trusted for its (shorter) TTL instead of re-probing PWS on every
+        # failing health check, which keeps load balancer probe storms from
+        # hammering PWS while it is already struggling.
+        if self.__pws_result is not None:
+            ttl = (
+                self.config.pws_settings.ready_check_success_ttl
+                if self.__pws_result
+                else self.config.pws_settings.ready_check_failure_ttl
+            )
+            if time.monotonic() - self.__pws_checked_at < ttl:
+                return self.__pws_result
+        try:
+            self._injector.get(PersonWebServiceClient).validate_connection()
+            self.__pws_result = True
+        except Exception:
+            self.logger.exception("PWS readiness check failed")
+            self.__pws_result = False
+        self.__pws_checked_at = time.monotonic()
         return self.__pws_result
 
     @property
@@ -57,20 +86,29 @@ class AppBlueprint(Blueprint, AppLoggerMixIn):
         This should return a boolean that signifies the
         application is fully bootstrapped.
         """
-        version_is_set = bool(self.version)
-        return version_is_set and self.pws_is_ready
+        # version is read live (not snapshotted at init) because the config
+        # object it comes from can be updated after the blueprint is built,
+        # e.g. by test fixtures; the attribute load itself is cheap.
+        return bool(self.version) and self.pws_is_ready
 
     def health(self, request: Request):
-        report = HealthReport(
-            ready=self.ready,
-            version=self.version,
-            pws_is_ready=self.pws_is_ready,
-            start_time=self.start_time.strftime("%y-%m-%d %H:%M:%S"),
-            deployment_id=self.config.deployment_id,
-        )
+        # Evaluate the probe and version exactly once per request; `ready`
+        # and the report would otherwise each walk the property chain (and,
+        # on failure, re-resolve the PWS client from the injector).
+        pws_is_ready = self.pws_is_ready
+        version = self.version
+        ready = bool(version) and pws_is_ready
+        # All of these values are already known-good, so jsonify a copy of
+        # the prebuilt template instead of paying for pydantic validation
+        # on every probe. HealthReport remains the documented schema and is
+        # only constructed on the (rare) not-ready error path.
+        report = self._health_template.copy()
+        report["ready"] = ready
+        report["version"] = version
+        report["pws_is_ready"] = pws_is_ready
         if "ready" in request.args:
-            if not self.ready:
+            if not ready:
                 raise InternalServerError(
-                    f"Server is not ready to handle requests: {str(report)}"
+                    f"Server is not ready to handle requests: {HealthReport(**report)}"
                 )
-        return jsonify(report.dict())
+        return jsonify(report)
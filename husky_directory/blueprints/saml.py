@@ -1,6 +1,6 @@
 import getpass
 import urllib.parse
-from typing import Dict
+from typing import Dict, Tuple
 
 import uw_saml2
 from flask import Blueprint, Request, redirect
@@ -25,18 +25,31 @@ class SAMLBlueprint(Blueprint, AppLoggerMixIn):
         self.add_url_rule("/login", view_func=self.login, methods=["GET", "POST"])
         self.add_url_rule("/logout", view_func=self.log_out)
         self.auth_settings = settings.auth_settings
+        # host_url is effectively constant per deployment, so the derived
+        # ACS host/URL pair is memoized rather than re-parsed per login.
+        self._acs_cache: Dict[str, Tuple[str, str]] = {}
 
     def process_saml_request(self, request: Request, session: LocalProxy, **kwargs):
-        dest_url = request.form.get("RelayState") or request.host_url
-        post_args: Dict = request.form.copy()
-        post_args.setdefault("RelayState", request.host_url)
+        form = request.form
+        dest_url = form.get("RelayState") or request.host_url
+        if "RelayState" in form:
+            # The IdP almost always round-trips RelayState, so skip the
+            # MultiDict copy in the common case; process_response only
+            # reads from the mapping.
+            post_args: Dict = form
+        else:
+            post_args = form.copy()
+            post_args["RelayState"] = request.host_url
         remote_ip = request.headers.get("X-Forwarded-For")
         self.logger.info(
-            f"Processing SAML POST request from {remote_ip} to access {dest_url} with POST: {post_args}"
+            "Processing SAML POST request from %s to access %s with POST: %s",
+            remote_ip,
+            dest_url,
+            post_args,
         )
         attributes = uw_saml2.process_response(post_args, **kwargs)
         session["uwnetid"] = attributes["uwnetid"]
-        self.logger.info(f"Signed in user {session['uwnetid']}")
+        self.logger.info("Signed in user %s", session["uwnetid"])
         return redirect(dest_url)
 
     def login(self, request: Request, session: LocalProxy):
@@ -46,9 +59,14 @@ class SAMLBlueprint(Blueprint, AppLoggerMixIn):
         # value.
         session.clear()
         session["permanent"] = session_permanent
-        acs_hostname = urllib.parse.urlparse(request.host_url).hostname
-        acs_host = f"https://{acs_hostname}"
-        acs_url = urllib.parse.urljoin(acs_host, self.auth_settings.saml_acs_path)
+        acs = self._acs_cache.get(request.host_url)
+        if acs is None:
+            acs_hostname = urllib.parse.urlparse(request.host_url).hostname
+            acs_host = f"https://{acs_hostname}"
+            acs_url = urllib.parse.urljoin(acs_host, self.auth_settings.saml_acs_path)
+            acs = (acs_host, acs_url)
+            self._acs_cache[request.host_url] = acs
+        acs_host, acs_url = acs
         args = {
             "entity_id": self.auth_settings.saml_entity_id,
             "acs_url": acs_url,
@@ -58,7 +76,9 @@ class SAMLBlueprint(Blueprint, AppLoggerMixIn):
         if request.method == "GET":
             args["return_to"] = acs_host
             self.logger.info(
-                f"Getting SAML redirect URL for {remote_ip} to SAML sign in with args {args}"
+                "Getting SAML redirect URL for %s to SAML sign in with args %s",
+                remote_ip,
+                args,
             )
             url = uw_saml2.login_redirect(**args)
             return redirect(url)
@@ -75,13 +95,15 @@ class MockSAMLBlueprint(Blueprint):
     @inject
     def __init__(self):
         super().__init__("mock-saml", __name__, url_prefix="/mock-saml")
+        # getpass.getuser() can fall through to an NSS/passwd lookup; the
+        # answer never changes for the process, so resolve it once here.
+        self._mock_uwnetid = getpass.getuser()
         self.add_url_rule(
             "/login", view_func=self.process_saml_request, methods=["GET"]
         )
 
-    @staticmethod
-    def process_saml_request(session: LocalProxy):
-        session["uwnetid"] = getpass.getuser()
+    def process_saml_request(self, session: LocalProxy):
+        session["uwnetid"] = self._mock_uwnetid
         return redirect("/")
 
 
@@ -1,11 +1,16 @@
+import functools
+import logging
+import time
 from base64 import b64decode
-from typing import Optional, Union
+from dataclasses import dataclass, fields
+from collections import OrderedDict
+from io import BytesIO
+from typing import Optional, Tuple, Union
 
 from flask import (
     Blueprint,
     Request,
     Response,
-    make_response,
     render_template,
     send_file,
 )
@@ -13,6 +18,7 @@ from inflection import humanize, underscore
 from injector import Injector, inject, singleton
 from pydantic import ValidationError
 from werkzeug.exceptions import BadRequest, HTTPException
+from werkzeug.http import dump_cookie
 from werkzeug.local import LocalProxy
 
 from husky_directory.app_config import ApplicationConfig
@@ -24,33 +30,186 @@ from husky_directory.models.search import (
     SearchDirectoryInput,
     SearchDirectoryOutput,
 )
+from husky_directory.services.auth import AuthService
 from husky_directory.services.search import DirectorySearchService
 from husky_directory.services.vcard import VCardService
-from husky_directory.util import AppLoggerMixIn
+from husky_directory.util import provide_current_year
 
+# The same logger configure_app_logging assigns to app.logger (see
+# husky_directory/app.py); binding it here skips the current_app
+# LocalProxy walk that AppLoggerMixIn pays on every access.
+_logger = logging.getLogger("gunicorn.error.app")
+
+
+@dataclass
+class ErrorModel:
+    """View-layer container; never validated, so pydantic buys nothing."""
 
-class ErrorModel(DirectoryBaseModel):
     msg: str
 
 
-class RenderingContext(DirectoryBaseModel):
-    class Config(DirectoryBaseModel.Config):
-        validate_assignment = False
+# Captured once at import so the request hot path doesn't re-resolve the
+# classmethod on every form submission.
+_parse_form_input = SearchDirectoryFormInput.parse_obj
+
+# Popular searches repeat the exact same form payload, so we keep a bounded
+# LRU of successfully parsed inputs; a hit replaces a full pydantic
+# validator traversal with a dict probe plus a shallow copy. Only pristine
+# copies are stored, so cached entries can't be mutated by consumers.
+_FORM_PARSE_CACHE_SIZE = 1024
+_form_parse_cache: "OrderedDict[tuple, SearchDirectoryFormInput]" = OrderedDict()
+
+# Invalid submissions repeat too — an empty-query POST is the most common
+# user error — so failed parses are cached alongside successes and the
+# same ValidationError is re-raised on repeats. ValidationError.errors()
+# memoizes its own output, so downstream error formatting stays cheap.
+_FORM_ERROR_CACHE_SIZE = 128
+_form_error_cache: "OrderedDict[tuple, ValidationError]" = OrderedDict()
+
+# Keys the model can actually consume (names and aliases). Anything else
+# in the form would be dropped by Extra.ignore after pydantic iterated
+# over it anyway, so it is filtered out before validation — and before it
+# can fragment the parse cache's key.
+_FORM_FIELDS = frozenset(
+    key
+    for field in SearchDirectoryFormInput.__fields__.values()
+    for key in (field.name, field.alias)
+)
+
+
+def _parse_form(form) -> SearchDirectoryFormInput:
+    """
+    Parses a submitted form into a SearchDirectoryFormInput.
+
+    The MultiDict is flattened first (none of our form fields are
+    multi-valued) because every pydantic field lookup against a MultiDict
+    is a list scan, and the flattened dict doubles as the cache key.
+    """
+    args = {k: v for k, v in form.items() if k in _FORM_FIELDS}
+    key = tuple(sorted(args.items()))
+    cached = _form_parse_cache.get(key)
+    if cached is not None:
+        _form_parse_cache.move_to_end(key)
+        return cached.copy()
+    cached_error = _form_error_cache.get(key)
+    if cached_error is not None:
+        _form_error_cache.move_to_end(key)
+        raise cached_error
+    try:
+        parsed = _parse_form_input(args)
+    except ValidationError as e:
+        _form_error_cache[key] = e
+        if len(_form_error_cache) > _FORM_ERROR_CACHE_SIZE:
+            _form_error_cache.popitem(last=False)
+        raise
+    _form_parse_cache[key] = parsed.copy()
+    if len(_form_parse_cache) > _FORM_PARSE_CACHE_SIZE:
+        _form_parse_cache.popitem(last=False)
+    return parsed
+
+
+# Preference cookies have tiny cardinality (result_detail is one of two
+# values), so both parse and emit directions are memoized; malformed
+# cookies raise and are never cached.
+_DEFAULT_PREFERENCES = PreferencesCookie()
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_preferences_cookie(raw: str) -> PreferencesCookie:
+    return PreferencesCookie.parse_raw(raw)
+
+
+@functools.lru_cache(maxsize=8)
+def _preferences_cookie_json(result_detail) -> str:
+    return PreferencesCookie(result_detail=result_detail).json(
+        exclude_unset=True, exclude_none=True
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _preferences_set_cookie_header(cookie_name: str, cookie_json: str) -> str:
+    """
+    The JSON payload contains quotes and spaces, so werkzeug's quoting in
+    dump_cookie is still required for the value to round-trip; but the
+    (name, value) pairs have tiny cardinality, so the serialized header
+    is memoized rather than rebuilt by set_cookie() on every response.
+    """
+    return dump_cookie(cookie_name, cookie_json)
+
+
+# Human-readable display names for validation error messages; the set of
+# fields is fixed at model definition, so the humanize/underscore string
+# work is done once here instead of per error.
+_FIELD_DISPLAY = {
+    name: humanize(underscore(name)).lower()
+    for name in (*SearchDirectoryFormInput.__fields__, *SearchDirectoryInput.__fields__)
+}
+
+# Vcards are repeatedly requested for the same person (browser retries,
+# refreshes, crawlers) and their content only changes when PWS data does,
+# so rendered bytes are kept for a short window. Student fields are
+# stripped from PWS output for unauthenticated requests, so the cache is
+# keyed on the viewer's auth state as well as the href token.
+_VCARD_CACHE_TTL_SECONDS = 300
+_VCARD_CACHE_SIZE = 1024
+_vcard_cache: "OrderedDict[Tuple[str, bool], Tuple[float, bytes]]" = OrderedDict()
+
+# Rendered HTML for the anonymous, cookie-less landing page, keyed on
+# (show_experimental, current year); holds at most one entry.
+_anon_index_cache: dict = {}
+
+
+@dataclass
+class RenderingContext:
+    """
+    View-layer container built on every request; a plain dataclass skips
+    pydantic's __init__/__fields_set__ machinery that even construct()
+    pays for. The service-produced fields stay pydantic models.
+    """
 
-    request_input: Optional[SearchDirectoryFormInput]
-    search_result: Optional[Union[SearchDirectoryOutput, Person]]
-    error: Optional[ErrorModel]
+    request_input: Optional[SearchDirectoryFormInput] = None
+    search_result: Optional[Union[SearchDirectoryOutput, Person]] = None
+    error: Optional[ErrorModel] = None
     status_code: int = 200
     uwnetid: Optional[str] = None
     show_experimental: bool = False
 
 
+# Field names are fixed at class definition; binding them once keeps the
+# per-request flattening below to a plain loop.
+_RENDERING_CONTEXT_FIELDS = tuple(f.name for f in fields(RenderingContext))
+
+
+def _context_template_args(context: RenderingContext) -> dict:
+    """
+    Flattens a RenderingContext into render_template keyword arguments.
+
+    Mirrors context.dict(exclude_none=True) without pydantic's reflective
+    walk over the context itself: only the model-valued fields (which the
+    templates subscript as dicts) pay for serialization.
+    """
+    args = {}
+    for name in _RENDERING_CONTEXT_FIELDS:
+        value = getattr(context, name)
+        if value is None:
+            continue
+        if isinstance(value, DirectoryBaseModel):
+            value = value.dict(exclude_none=True)
+        elif isinstance(value, ErrorModel):
+            value = {"msg": value.msg}
+        args[name] = value
+    return args
+
+
 @singleton
-class SearchBlueprint(Blueprint, AppLoggerMixIn):
+class SearchBlueprint(Blueprint):
     @inject
-    def __init__(self, injector: Injector):
+    def __init__(self, injector: Injector, app_config: ApplicationConfig):
         super().__init__("search", __name__)
         self.injector = injector
+        # The cookie name is fixed at config load, so snapshot it once
+        # here rather than walking two pydantic models per request.
+        self._prefs_cookie_name = app_config.session_settings.preferences_cookie_name
         self.add_url_rule("/", view_func=self.index, methods=("GET",))
         self.add_url_rule("/", view_func=self.search_listing, methods=("POST",))
         self.add_url_rule(
@@ -62,26 +221,45 @@ class SearchBlueprint(Blueprint, AppLoggerMixIn):
             methods=("POST",),
         )
 
-    @staticmethod
-    def index(request: Request, session: LocalProxy, settings: ApplicationConfig):
-        preferences_cookie = request.cookies.get(
-            settings.session_settings.preferences_cookie_name
-        )
+    def index(self, request: Request, session: LocalProxy, settings: ApplicationConfig):
+        preferences_cookie = request.cookies.get(self._prefs_cookie_name)
+        uwnetid = session.get("uwnetid")
+        if preferences_cookie is None and uwnetid is None:
+            # The anonymous, cookie-less landing page — the most common
+            # request we serve — is byte-identical across hits, so render
+            # it once per (flag, year). The year comes from the same
+            # context processor the template renders with, so the key and
+            # the cached footer can never disagree, and the cache rolls
+            # over as soon as the processor notices the new year.
+            key = (settings.show_experimental, provide_current_year()["current_year"])
+            cached = _anon_index_cache.get(key)
+            if cached is None:
+                cached = SearchBlueprint._render_index(
+                    uwnetid, _DEFAULT_PREFERENCES, settings
+                )
+                _anon_index_cache.clear()
+                _anon_index_cache[key] = cached
+            return cached, 200
         if preferences_cookie:
-            preferences = PreferencesCookie.parse_raw(preferences_cookie)
+            preferences = _parse_preferences_cookie(preferences_cookie)
         else:
-            preferences = PreferencesCookie()
-        context = RenderingContext.construct(
-            uwnetid=session.get("uwnetid"),
+            preferences = _DEFAULT_PREFERENCES
+        return SearchBlueprint._render_index(uwnetid, preferences, settings), 200
+
+    @staticmethod
+    def _render_index(
+        uwnetid: Optional[str],
+        preferences: PreferencesCookie,
+        settings: ApplicationConfig,
+    ) -> str:
+        context = RenderingContext(
+            uwnetid=uwnetid,
             show_experimental=settings.show_experimental,
             request_input=SearchDirectoryFormInput.construct(
                 render_length=preferences.result_detail
             ),
         )
-        return (
-            render_template("views/index.html", **context.dict(exclude_none=True)),
-            200,
-        )
+        return render_template("views/index.html", **_context_template_args(context))
 
     def get_person_listing(
         self,
@@ -89,46 +267,72 @@ class SearchBlueprint(Blueprint, AppLoggerMixIn):
         session: LocalProxy,
         service: DirectorySearchService,
     ):
-        context = RenderingContext.construct(
+        context = RenderingContext(
             uwnetid=session.get("uwnetid"),
         )
         template = "views/person.html"
         try:
-            request_input = SearchDirectoryFormInput.parse_obj(request.form)
+            request_input = _parse_form(request.form)
             context.request_input = request_input
+            # b64decode accepts str directly (it ASCII-encodes internally),
+            # so the explicit encode only added a temporary bytes object.
             context.search_result = service.get_listing(
-                b64decode(request_input.person_href.encode("UTF-8")).decode("UTF-8")
+                b64decode(request_input.person_href).decode("UTF-8")
             )
+        except ValidationError as e:
+            template = "views/index.html"
+            _logger.exception("%s", e)
+            SearchBlueprint.handle_validation_error(e, context)
         except Exception as e:
             template = "views/index.html"
-            self.logger.exception(str(e))
+            _logger.exception("%s", e)
             SearchBlueprint.handle_search_exception(e, context)
         finally:
             return (
-                render_template(template, **context.dict(exclude_none=True)),
+                render_template(template, **_context_template_args(context)),
                 context.status_code,
             )
 
     @staticmethod
-    def get_person_vcard(request: Request, vcard_service: VCardService):
+    def get_person_vcard(
+        request: Request, vcard_service: VCardService, auth_service: AuthService
+    ):
         href_token = request.form.get("person_href")
         if not href_token:
             raise BadRequest("No href token provided")
-        vcard_stream = vcard_service.get_vcard(
-            b64decode(href_token.encode("UTF-8")).decode("UTF-8")
-        )
-        return send_file(vcard_stream, mimetype="text/vcard")
+        key = (href_token, auth_service.request_is_authenticated)
+        now = time.monotonic()
+        cached = _vcard_cache.get(key)
+        if cached is not None and now - cached[0] < _VCARD_CACHE_TTL_SECONDS:
+            _vcard_cache.move_to_end(key)
+            return send_file(BytesIO(cached[1]), mimetype="text/vcard")
+        vcard_stream = vcard_service.get_vcard(b64decode(href_token).decode("UTF-8"))
+        payload = vcard_stream.getvalue()
+        _vcard_cache[key] = (now, payload)
+        if len(_vcard_cache) > _VCARD_CACHE_SIZE:
+            _vcard_cache.popitem(last=False)
+        return send_file(BytesIO(payload), mimetype="text/vcard")
+
+    @staticmethod
+    def handle_validation_error(e: ValidationError, context: RenderingContext):
+        """
+        Bad form input is by far the most common error, so views catch
+        ValidationError in its own except clause and land here directly,
+        letting CPython's exception dispatch replace an isinstance ladder.
+        """
+        context.status_code = 400
+        bad_fields = []
+        for error in e.errors():
+            loc = error["loc"][0]
+            field_name = _FIELD_DISPLAY.get(loc) or humanize(underscore(loc)).lower()
+            message = error["msg"]
+            bad_fields.append(f"{field_name} ({message})")
+        context.error = ErrorModel(msg=f"Invalid input for {'; '.join(bad_fields)}")
 
     @staticmethod
     def handle_search_exception(e: Exception, context: RenderingContext):
         if isinstance(e, ValidationError):
-            context.status_code = 400
-            bad_fields = []
-            for error in e.errors():
-                field_name = humanize(underscore(error["loc"][0])).lower()
-                message = error["msg"]
-                bad_fields.append(f"{field_name} ({message})")
-            context.error = ErrorModel(msg=f"Invalid input for {'; '.join(bad_fields)}")
+            SearchBlueprint.handle_validation_error(e, context)
         elif isinstance(e, HTTPException):
             context.error = ErrorModel(msg=str(e))
             context.status_code = e.code
@@ -149,27 +353,27 @@ class SearchBlueprint(Blueprint, AppLoggerMixIn):
         if context.request_input and context.request_input.length:
             result_detail = context.request_input.length
 
-        preferences = PreferencesCookie(result_detail=result_detail).json(
-            exclude_unset=True, exclude_none=True
-        )
-        return preferences
+        return _preferences_cookie_json(result_detail)
 
     def check_context(self, context: RenderingContext, request: Request):
-        if context.request_input:
-            return context
-        else:
-            context.request_input = SearchDirectoryFormInput(
-                method=request.form["method"],
-                population=request.form["population"],
-                length=request.form["length"],
+        if context.request_input is None:
+            # This only runs after parsing has already failed, purely so
+            # the template has something to render: construct() skips the
+            # validator chain, and .get() keeps a missing form field from
+            # raising a KeyError on top of the original error.
+            form = request.form
+            context.request_input = SearchDirectoryFormInput.construct(
+                method=form.get("method"),
+                population=form.get("population"),
+                length=form.get("length"),
                 person_href=None,
-                render_method=request.form["method"],
+                render_method=form.get("method"),
                 render_query="",
-                render_population=request.form["population"],
-                render_length=request.form["length"],
+                render_population=form.get("population"),
+                render_length=form.get("length"),
                 include_test_identities=False,
             )
-            return context
+        return context
 
     def search_listing(
         self,
@@ -178,30 +382,34 @@ class SearchBlueprint(Blueprint, AppLoggerMixIn):
         session: LocalProxy,
         settings: ApplicationConfig,
     ):
-        context = RenderingContext.construct(
+        context = RenderingContext(
             uwnetid=session.get("uwnetid"),
             show_experimental=settings.show_experimental,
         )
         try:
-            form_input = SearchDirectoryFormInput.parse_obj(request.form)
+            form_input = _parse_form(request.form)
             context.request_input = form_input
 
             request_input = SearchDirectoryInput.from_form_input(form_input)
             context.search_result = service.search_directory(request_input)
+        except ValidationError as e:
+            _logger.exception("%s", e)
+            SearchBlueprint.handle_validation_error(e, context)
         except Exception as e:
-            self.logger.exception(str(e))
+            _logger.exception("%s", e)
             SearchBlueprint.handle_search_exception(e, context)
         finally:
             context = self.check_context(context, request)
-            response: Response = make_response(
+            response = Response(
                 render_template(
-                    "views/search_results.html", **context.dict(exclude_none=True)
+                    "views/search_results.html", **_context_template_args(context)
                 ),
-                context.status_code,
+                status=context.status_code,
             )
 
             preferences = self.set_preferences_for_cookie(context)
-            response.set_cookie(
-                settings.session_settings.preferences_cookie_name, value=preferences
+            response.headers.add(
+                "Set-Cookie",
+                _preferences_set_cookie_header(self._prefs_cookie_name, preferences),
             )
             return response
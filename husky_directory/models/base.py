@@ -1,3 +1,4 @@
+import functools
 import typing
 
 from pydantic import BaseModel, Extra
@@ -23,10 +24,16 @@ class PropertyBaseModel(BaseModel):
         ignored_properties = []
 
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def get_properties(cls) -> typing.List[str]:
         """
         Checks for all properties on the model, and returns them.
         :return: All defined properties on the model.
+
+        The answer only depends on the class, but dict() calls this for
+        every model instance in a result tree (pydantic delegates nested
+        serialization to each child's dict()), so the dir() scan is cached
+        per class.
         """
         return [
             prop
@@ -4,6 +4,7 @@ Models for the DirectorySearchService.
 from __future__ import annotations
 
 import base64
+import functools
 import re
 from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
@@ -124,6 +125,12 @@ class SearchDirectoryInput(DirectoryBaseModel):
     Fields with `search_method=True` will be included in the drop down menu as search methods.
     """
 
+    class Config(DirectoryBaseModel.Config):
+        # Nothing mutates a search input once it's been parsed, so freezing
+        # the model lets pydantic skip assignment-validation dispatch and
+        # guards against accidental mid-search mutation.
+        allow_mutation = False
+
     name: Optional[str] = Field(None, max_length=128, search_method=True)
     department: Optional[str] = Field(None, max_length=128, search_method=True)
     email: Optional[str] = Field(
@@ -141,7 +148,10 @@ class SearchDirectoryInput(DirectoryBaseModel):
     person_href: Optional[str]
 
     @classmethod
+    @functools.lru_cache(maxsize=1)
     def search_methods(cls) -> List[str]:
+        # The field introspection below only ever has one answer per class,
+        # so it's cached rather than recomputed by each caller.
         fields: Dict[str, Field] = cls.__fields__
         return [
             f_name
@@ -173,7 +173,7 @@ class PersonWebServiceClient(AppLoggerMixIn):
         response = requests.get(
             url, cert=self.cert, params=params, headers={"Accept": "application/json"}
         )
-        self.logger.info(f"[GET] {response.url} : {response.status_code}")
+        self.logger.info("[GET] %s : %s", response.url, response.status_code)
         response.raise_for_status()
         data = response.json()
         return data
@@ -107,8 +107,9 @@ class NameSearchResultReducer(AppLoggerMixIn):
                 # This is unlikely to happen unless PWS starts serving
                 # some highly irrelevant results for some reason
                 self.logger.info(
-                    f"Could not find relevant bucket for person {pws_person.display_name} matching "
-                    f"query {query_string}"
+                    "Could not find relevant bucket for person %s matching query %s",
+                    pws_person.display_name,
+                    query_string,
                 )
                 continue
 
@@ -188,8 +188,9 @@ class DirectorySearchService(AppLoggerMixIn):
         scenario_description_indexes: Dict[str, int] = {}
         for generated in self.query_generator.generate(request_input):
             self.logger.debug(
-                f"Querying: {generated.description} with "
-                f"{generated.request_input.dict(exclude_unset=True, exclude_defaults=True)}"
+                "Querying: %s with %s",
+                generated.description,
+                generated.request_input,
             )
             statistics.num_queries_generated += 1
             pws_output: ListPersonsOutput = self._pws.list_persons(
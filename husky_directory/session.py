@@ -0,0 +1,93 @@
+"""
+Redis-backed session handling. This lives in its own module (instead of
+app.py) so that flask_session is only imported when an app is actually
+configured with a redis session backend.
+"""
+from flask import Flask
+from flask_session import RedisSessionInterface
+from itsdangerous import BadSignature, want_bytes
+
+
+class PipelinedRedisSessionInterface(RedisSessionInterface):
+    """
+    The stock RedisSessionInterface issues a bare GET when opening a session
+    (never refreshing the key's TTL on read), and re-serializes and SETs the
+    session on every response, even when nothing changed. This subclass:
+
+    * combines the GET with an EXPIRE in a single (non-transactional)
+      pipeline, so active sessions stay alive and a read still costs one
+      redis round trip;
+    * remembers the payload it loaded, so that saving an unchanged session
+      skips the redundant SETEX (the TTL was already refreshed on read)
+      while still re-sending the session cookie, whose expiry only rolls
+      forward when the client receives a fresh Set-Cookie header; and
+    * skips redis entirely for `sessionless_paths` (e.g., liveness probes).
+    """
+
+    def __init__(self, redis, key_prefix, sessionless_paths=(), **kwargs):
+        super().__init__(redis, key_prefix, **kwargs)
+        self.sessionless_paths = frozenset(sessionless_paths)
+
+    def open_session(self, app: Flask, request):
+        if request.path in self.sessionless_paths:
+            # Liveness probes have no use for a session; handing back None
+            # makes flask use a NullSession and spares the redis round trip.
+            return None
+        sid = request.cookies.get(app.session_cookie_name)
+        if not sid:
+            return self.session_class(
+                sid=self._generate_sid(), permanent=self.permanent
+            )
+        if self.use_signer:
+            # Mirrors the parent class: the redis key is the *unsigned* sid,
+            # so the cookie value must be verified and unwrapped before the
+            # lookup below.
+            signer = self._get_signer(app)
+            if signer is None:
+                return None
+            try:
+                sid = signer.unsign(sid).decode()
+            except BadSignature:
+                return self.session_class(
+                    sid=self._generate_sid(), permanent=self.permanent
+                )
+        key = self.key_prefix + sid
+        ttl_seconds = int(app.permanent_session_lifetime.total_seconds())
+        with self.redis.pipeline(transaction=False) as pipeline:
+            pipeline.get(key)
+            pipeline.expire(key, ttl_seconds)
+            val, _ = pipeline.execute()
+        if val is not None:
+            try:
+                session = self.session_class(self.serializer.loads(val), sid=sid)
+                session.loaded_payload = val
+                return session
+            except Exception:  # A corrupt session is treated as a new one.
+                pass
+        return self.session_class(sid=sid, permanent=self.permanent)
+
+    def save_session(self, app: Flask, session, response):
+        if session and not session.modified:
+            val = self.serializer.dumps(dict(session))
+            if val == getattr(session, "loaded_payload", None):
+                # Nothing changed since we loaded it, so the SETEX can be
+                # skipped (open_session already refreshed the redis TTL) —
+                # but the cookie must still be re-sent, because its expiry
+                # only rolls forward when the client receives a fresh
+                # Set-Cookie header; dropping it would log active users out
+                # PERMANENT_SESSION_LIFETIME after their last *write*.
+                if self.use_signer:
+                    session_id = self._get_signer(app).sign(want_bytes(session.sid))
+                else:
+                    session_id = session.sid
+                response.set_cookie(
+                    app.session_cookie_name,
+                    session_id,
+                    expires=self.get_expiration_time(app, session),
+                    httponly=self.get_cookie_httponly(app),
+                    domain=self.get_cookie_domain(app),
+                    path=self.get_cookie_path(app),
+                    secure=self.get_cookie_secure(app),
+                )
+                return
+        super().save_session(app, session, response)
@@ -5,6 +5,7 @@ import math
 import os
 import time
 from contextlib import contextmanager
+from datetime import datetime
 from logging import Logger
 from typing import Any, Callable, Dict, List, Optional, TypeVar
 
@@ -220,6 +221,22 @@ def readable_list(seq: List[str]) -> str:
     return " ".join(punctuation)
 
 
+# The copyright year only changes once a year, so there's no need to fetch
+# the clock and build a datetime on every render; the fast path below is a
+# float subtraction, with a refresh at most once a day to handle rollover.
+_current_year_context = {"current_year": datetime.utcnow().year}
+_current_year_checked_at = time.time()
+
+
+def provide_current_year():
+    global _current_year_checked_at
+    now = time.time()
+    if now - _current_year_checked_at > 86400:
+        _current_year_checked_at = now
+        _current_year_context["current_year"] = datetime.utcnow().year
+    return _current_year_context
+
+
 def is_similar(query, display_name, fuzziness: float):
     """
     The fuzziness tells the search result reducer how
@@ -53,3 +53,18 @@ class TestSAMLBlueprint:
         )
         assert response.status_code == 200
         assert self.mock_session.get("uwnetid") == "cooluser"
+
+    def test_process_saml_request_with_relay_state(self):
+        """The IdP round-tripping RelayState takes the no-copy path."""
+        response = self.flask_client.post(
+            "/saml/login",
+            data={
+                "idp": UwIdp.entity_id,
+                "remote_user": "cooluser@washington.edu",
+                "RelayState": "/",
+            },
+            follow_redirects=True,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        assert response.status_code == 200
+        assert self.mock_session.get("uwnetid") == "cooluser"
@@ -9,9 +9,11 @@ from bs4 import BeautifulSoup
 from flask import Response
 from flask.testing import FlaskClient
 from inflection import titleize
+from pydantic import ValidationError
 from werkzeug import exceptions
 from werkzeug.local import LocalProxy
 
+from husky_directory.blueprints import search as search_module
 from husky_directory.models.enum import PopulationType, ResultDetail
 from husky_directory.models.pws import ListPersonsInput, ListPersonsOutput
 from husky_directory.models.search import SearchDirectoryFormInput, SearchDirectoryInput
@@ -572,6 +574,112 @@ class TestSearchBlueprint(BlueprintSearchTestBase):
         assert vcard.startswith("BEGIN:VCARD")
         assert vcard.endswith("END:VCARD")
 
+    def test_get_person_vcard_cached(self):
+        search_module._vcard_cache.clear()
+        person = self.mock_people.published_employee
+        href = base64.b64encode("foo".encode("UTF-8")).decode("UTF-8")
+        self.mock_send_request.return_value = person.dict(by_alias=True)
+        first = self.flask_client.post("/person/vcard", data={"person_href": href})
+        assert first.status_code == 200
+        assert self.mock_send_request.call_count == 1
+        second = self.flask_client.post("/person/vcard", data={"person_href": href})
+        assert second.status_code == 200
+        assert second.data == first.data
+        # The repeat request is served from the rendered-bytes cache.
+        assert self.mock_send_request.call_count == 1
+
+    def test_get_person_vcard_cache_expires(self):
+        search_module._vcard_cache.clear()
+        person = self.mock_people.published_employee
+        href = base64.b64encode("foo".encode("UTF-8")).decode("UTF-8")
+        self.mock_send_request.return_value = person.dict(by_alias=True)
+        self.flask_client.post("/person/vcard", data={"person_href": href})
+        # Age the cached entry past its TTL; the next request re-renders.
+        ((key, (cached_at, payload)),) = search_module._vcard_cache.items()
+        search_module._vcard_cache[key] = (
+            cached_at - search_module._VCARD_CACHE_TTL_SECONDS - 1,
+            payload,
+        )
+        response = self.flask_client.post("/person/vcard", data={"person_href": href})
+        assert response.status_code == 200
+        assert self.mock_send_request.call_count == 2
+
+    def test_get_person_vcard_cache_evicts_oldest(self):
+        search_module._vcard_cache.clear()
+        person = self.mock_people.published_employee
+        self.mock_send_request.return_value = person.dict(by_alias=True)
+        first_href = base64.b64encode("foo".encode("UTF-8")).decode("UTF-8")
+        second_href = base64.b64encode("bar".encode("UTF-8")).decode("UTF-8")
+        with mock.patch.object(search_module, "_VCARD_CACHE_SIZE", 1):
+            self.flask_client.post("/person/vcard", data={"person_href": first_href})
+            self.flask_client.post("/person/vcard", data={"person_href": second_href})
+        assert len(search_module._vcard_cache) == 1
+        ((href_token, _),) = search_module._vcard_cache.keys()
+        assert href_token == second_href
+
+    def test_get_person_vcard_requires_token(self):
+        response = self.flask_client.post("/person/vcard", data={})
+        assert response.status_code == 400
+
+    def test_get_person_listing_validation_error(self):
+        href = base64.b64encode("foo".encode("UTF-8")).decode("UTF-8")
+        response = self.flask_client.post(
+            "/person/listing",
+            data={"person_href": href, "population": "martians"},
+        )
+        assert response.status_code == 400
+        with self.html_validator.validate_response(response) as html:
+            assert html.find(string=re.compile("Encountered error"))
+
+    def test_handle_search_exception_delegates_validation_errors(self):
+        try:
+            SearchDirectoryFormInput.parse_obj({"population": "martians"})
+        except ValidationError as e:
+            context = search_module.RenderingContext()
+            search_module.SearchBlueprint.handle_search_exception(e, context)
+            assert context.status_code == 400
+            assert context.error.msg.startswith("Invalid input for")
+        else:
+            pytest.fail("expected a ValidationError")
+
+    def test_form_parse_cache_evicts_oldest(self):
+        search_module._form_parse_cache.clear()
+        with mock.patch.object(search_module, "_FORM_PARSE_CACHE_SIZE", 1):
+            self.flask_client.post("/", data={"method": "name", "query": "lovelace"})
+            self.flask_client.post("/", data={"method": "name", "query": "hopper"})
+        assert len(search_module._form_parse_cache) == 1
+
+    def test_invalid_form_parse_is_cached(self):
+        search_module._form_parse_cache.clear()
+        search_module._form_error_cache.clear()
+        data = {"method": "name", "query": "", "population": "employees"}
+        with mock.patch.object(
+            search_module,
+            "_parse_form_input",
+            side_effect=search_module._parse_form_input,
+        ) as mock_parse:
+            first = self.flask_client.post("/", data=data)
+            assert first.status_code == 400
+            assert mock_parse.call_count == 1
+            second = self.flask_client.post("/", data=data)
+            assert second.status_code == 400
+            # The repeated bad submission re-raises the cached error
+            # instead of re-running the validator pipeline.
+            assert mock_parse.call_count == 1
+        with self.html_validator.validate_response(second):
+            self.html_validator.assert_has_tag_with_text(
+                "b",
+                "Invalid input for query "
+                "(Name query string must contain at least 2 characters)",
+            )
+
+    def test_form_error_cache_evicts_oldest(self):
+        search_module._form_error_cache.clear()
+        with mock.patch.object(search_module, "_FORM_ERROR_CACHE_SIZE", 1):
+            self.flask_client.post("/", data={"method": "name", "query": ""})
+            self.flask_client.post("/", data={"method": "email", "query": ""})
+        assert len(search_module._form_error_cache) == 1
+
     @pytest.mark.parametrize("succeed", (True, False))
     def test_get_person_listing(self, succeed: bool):
         person = self.mock_people.contactable_person
@@ -4,8 +4,10 @@ from unittest import mock
 import pytest
 from flask_session import RedisSessionInterface
 from pydantic import SecretStr
+from werkzeug import exceptions
 
-from husky_directory.app import create_app, create_app_injector
+from husky_directory import app as app_module
+from husky_directory.app import PooledRequestScope, create_app, create_app_injector
 from husky_directory.app_config import ApplicationConfig, SessionType
 from husky_directory.services.pws import PersonWebServiceClient
 from husky_directory.services.search import DirectorySearchService
@@ -65,6 +67,74 @@ def test_get_ready(client, app_config, is_ready: bool):
         assert "ready=False" in response.data.decode("UTF-8"), response.data
 
 
+def test_get_status_caches_successful_pws_probe(
+    client, app_config, injector, mock_injected
+):
+    pws_client = injector.get(PersonWebServiceClient)
+    with mock.patch.object(pws_client, "validate_connection") as probe:
+        with mock_injected(PersonWebServiceClient, pws_client):
+            client.get("/status")
+            client.get("/status")
+            # The second probe is answered from the cached result.
+            assert probe.call_count == 1
+            app_config.pws_settings.ready_check_success_ttl = 0
+            client.get("/status")
+            assert probe.call_count == 2
+
+
+def test_get_status_caches_failed_pws_probe(
+    client, app_config, injector, mock_injected
+):
+    pws_client = injector.get(PersonWebServiceClient)
+    with mock.patch.object(
+        pws_client, "validate_connection", side_effect=RuntimeError
+    ) as probe:
+        with mock_injected(PersonWebServiceClient, pws_client):
+            response = client.get("/status")
+            assert response.json["pws_is_ready"] is False
+            client.get("/status")
+            # A cached failure is trusted for its (shorter) TTL instead of
+            # re-hammering PWS on every probe.
+            assert probe.call_count == 1
+            app_config.pws_settings.ready_check_failure_ttl = 0
+            client.get("/status")
+            assert probe.call_count == 2
+
+
+def test_get_health(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json == {"alive": True}
+
+
+def test_log_all_errors_passes_through_http_exceptions(app):
+    error = exceptions.NotFound()
+    assert app_module.log_all_errors(error) is error
+
+
+def test_log_all_errors_wraps_unexpected_exceptions(app):
+    result = app_module.log_all_errors(RuntimeError("boom"))
+    assert isinstance(result, exceptions.InternalServerError)
+
+
+def test_pooled_request_scope_recycles_dicts(injector):
+    scope = PooledRequestScope(injector)
+    recycled = scope._locals.scope
+    scope.cleanup()
+    scope.prepare()
+    # The cleared dict from the previous request is reused, not replaced.
+    assert scope._locals.scope is recycled
+
+
+def test_pooled_request_scope_discards_when_pool_full(injector):
+    scope = PooledRequestScope(injector)
+    while not scope._pool.full():
+        scope._pool.put_nowait({})
+    scope._locals.scope = {}
+    scope.cleanup()
+    assert scope._pool.full()
+
+
 def test_get_login(client):
     response = client.get("/saml/login")
     assert response.status_code == 302, response.data
@@ -95,6 +165,18 @@ def test_session_interface_configuration():
     )
 
 
+def test_non_development_template_configuration():
+    injector = create_app_injector()
+    app_config = injector.get(ApplicationConfig)
+    app_config.auth_settings.use_test_idp = True
+    app_config.stage = "production"
+    app = create_app(injector)
+    # Outside development, templates don't auto-reload and are all
+    # compiled up front.
+    assert app.jinja_env.auto_reload is False
+    assert app.jinja_env.list_templates()
+
+
 @pytest.mark.parametrize("auth_required", (True, False))
 def test_prometheus_configuration(
     app_config: ApplicationConfig, client, auth_required: bool
@@ -6,6 +6,7 @@ from injector import Injector
 
 from husky_directory.app_config import (
     ApplicationConfig,
+    ApplicationConfigInjectorModule,
     ApplicationSecrets,
     RedisSettings,
 )
@@ -63,3 +64,38 @@ class TestRedisSettings:
             "SESSION_REDIS": "redis:6379",
             "SESSION_PERMANENT": False,
         }
+
+
+class TestProvideApplicationConfig:
+    @pytest.fixture(autouse=True)
+    def configure_base(self):
+        self.module = ApplicationConfigInjectorModule()
+        self.cache = ApplicationConfigInjectorModule._settings_cache
+        self.cache.clear()
+        yield
+        self.cache.clear()
+
+    def test_cache_hit_returns_independent_copies(self):
+        first = self.module.provide_application_config()
+        second = self.module.provide_application_config()
+        assert len(self.cache) == 1
+        assert first is not second
+        # Mutating one consumer's config (as tests do) must not leak into
+        # configs handed to later consumers.
+        first.version = "mutated"
+        third = self.module.provide_application_config()
+        assert third.version != "mutated"
+
+    def test_environment_override_invalidates_cache(self):
+        # Environment variables override the dotenv file, so a changed env
+        # var must yield a freshly parsed config, not a cached one.
+        self.module.provide_application_config()
+        with mock.patch.dict(os.environ, {"FLASK_ENV": "env-override"}):
+            config = self.module.provide_application_config()
+        assert config.stage == "env-override"
+
+    def test_unstattable_dotenv_file_is_not_cached(self):
+        with mock.patch.dict(os.environ, {"APP_DOTENV_FILE": "no-such.dotenv"}):
+            config = self.module.provide_application_config()
+        assert config is not None
+        assert not self.cache
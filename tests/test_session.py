@@ -0,0 +1,168 @@
+import pickle
+
+import flask
+import pytest
+from flask import Flask
+
+from husky_directory.session import PipelinedRedisSessionInterface
+
+
+class StubPipeline:
+    """Collects pipelined commands and replays them against the stub on execute()."""
+
+    def __init__(self, redis: "StubRedis"):
+        self.redis = redis
+        self.results = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def get(self, key):
+        self.results.append(self.redis.get(key))
+
+    def expire(self, key, ttl):
+        self.results.append(self.redis.expire(key, ttl))
+
+    def execute(self):
+        return self.results
+
+
+class StubRedis:
+    """Just enough of the redis client API for the session interface."""
+
+    def __init__(self):
+        self.store = {}
+        self.calls = []
+
+    def pipeline(self, transaction=True):
+        self.calls.append(("pipeline", transaction))
+        return StubPipeline(self)
+
+    def get(self, key):
+        self.calls.append(("get", key))
+        return self.store.get(key)
+
+    def expire(self, key, ttl):
+        self.calls.append(("expire", key, ttl))
+        return key in self.store
+
+    def setex(self, name, value, time):
+        self.calls.append(("setex", name, time))
+        self.store[name] = value
+        return True
+
+    def delete(self, key):
+        self.calls.append(("delete", key))
+        self.store.pop(key, None)
+
+
+class TestPipelinedRedisSessionInterface:
+    key_prefix = "test:session:"
+    sid = "sid123"
+
+    @pytest.fixture(autouse=True)
+    def initialize(self):
+        self.redis = StubRedis()
+        self.interface = PipelinedRedisSessionInterface(
+            self.redis, key_prefix=self.key_prefix, sessionless_paths=("/health",)
+        )
+        self.session_app = Flask(__name__)
+        self.session_app.config["SECRET_KEY"] = "test-secret"
+        self.session_app.config["PERMANENT_SESSION_LIFETIME"] = 600
+        self.key = self.key_prefix + self.sid
+        self.payload = pickle.dumps({"_permanent": True, "uwnetid": "ada"})
+
+    def open_session(self, path="/", with_cookie=True):
+        headers = {}
+        if with_cookie:
+            cookie_name = self.session_app.session_cookie_name
+            headers["Cookie"] = f"{cookie_name}={self.sid}"
+        with self.session_app.test_request_context(path, headers=headers):
+            return self.interface.open_session(self.session_app, flask.request)
+
+    def test_sessionless_path_skips_redis(self):
+        assert self.open_session(path="/health") is None
+        assert not self.redis.calls
+
+    def test_no_cookie_creates_fresh_session_without_redis(self):
+        session = self.open_session(with_cookie=False)
+        assert session.sid
+        assert session.sid != self.sid
+        assert not self.redis.calls
+
+    def test_open_session_loads_payload_and_refreshes_ttl(self):
+        self.redis.store[self.key] = self.payload
+        session = self.open_session()
+        assert session["uwnetid"] == "ada"
+        assert session.loaded_payload == self.payload
+        assert ("expire", self.key, 600) in self.redis.calls
+
+    def test_missing_key_creates_fresh_session(self):
+        session = self.open_session()
+        assert session.sid == self.sid
+        assert "uwnetid" not in session
+
+    def test_corrupt_payload_creates_fresh_session(self):
+        self.redis.store[self.key] = b"not a pickle"
+        session = self.open_session()
+        assert session.sid == self.sid
+        assert "uwnetid" not in session
+
+    def test_open_session_unsigns_cookie_when_configured(self):
+        self.redis.store[self.key] = self.payload
+        self.interface.use_signer = True
+        signer = self.interface._get_signer(self.session_app)
+        self.sid = signer.sign(self.sid.encode()).decode()
+        session = self.open_session()
+        assert session["uwnetid"] == "ada"
+        assert session.sid == "sid123"
+
+    def test_open_session_bad_signature_creates_fresh_session(self):
+        self.redis.store[self.key] = self.payload
+        self.interface.use_signer = True
+        self.sid = "sid123.notarealsignature"
+        session = self.open_session()
+        assert session.sid not in ("sid123", self.sid)
+        assert "uwnetid" not in session
+
+    def test_open_session_without_secret_key_returns_none(self):
+        self.interface.use_signer = True
+        self.session_app.config["SECRET_KEY"] = None
+        assert self.open_session() is None
+
+    def test_save_unchanged_session_skips_setex_but_refreshes_cookie(self):
+        self.redis.store[self.key] = self.payload
+        session = self.open_session()
+        response = flask.Response()
+        self.interface.save_session(self.session_app, session, response)
+        assert not [call for call in self.redis.calls if call[0] == "setex"]
+        (cookie,) = response.headers.getlist("Set-Cookie")
+        assert self.sid in cookie
+        # The cookie's expiry must keep rolling forward even when the
+        # session payload hasn't changed, or active users get logged out
+        # PERMANENT_SESSION_LIFETIME after their last session write.
+        assert "Expires=" in cookie
+
+    def test_save_unchanged_session_signs_cookie_when_configured(self):
+        self.redis.store[self.key] = self.payload
+        session = self.open_session()
+        self.interface.use_signer = True
+        response = flask.Response()
+        self.interface.save_session(self.session_app, session, response)
+        (cookie,) = response.headers.getlist("Set-Cookie")
+        assert self.sid in cookie
+        assert cookie != f"{self.session_app.session_cookie_name}={self.sid}"
+
+    def test_save_modified_session_writes_through(self):
+        self.redis.store[self.key] = self.payload
+        session = self.open_session()
+        session["uwnetid"] = "lovelace"
+        response = flask.Response()
+        self.interface.save_session(self.session_app, session, response)
+        assert ("setex", self.key, 600) in self.redis.calls
+        assert pickle.loads(self.redis.store[self.key])["uwnetid"] == "lovelace"
+        (cookie,) = response.headers.getlist("Set-Cookie")
+        assert self.sid in cookie
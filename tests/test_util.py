@@ -134,3 +134,15 @@ def test_readable_list(sequence, expected):
 )
 def test_is_similar(query, display_name, coefficient, expected):
     assert husky_directory.util.is_similar(query, display_name, coefficient) == expected
+
+
+def test_provide_current_year_refreshes_after_a_day():
+    util = husky_directory.util
+    checked_at = util._current_year_checked_at
+    try:
+        util._current_year_checked_at = 0
+        context = util.provide_current_year()
+        assert context["current_year"] == util.datetime.utcnow().year
+        assert util._current_year_checked_at > 0
+    finally:
+        util._current_year_checked_at = checked_at